@@ -1,128 +1,386 @@
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from langchain.agents import AgentExecutor, create_openai_functions_agent
+import logging
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Type
+from pydantic import BaseModel, Field
+from langchain.agents import AgentExecutor
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.tools import BaseTool
-from langchain.schema import BaseMessage, HumanMessage, AIMessage
+from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema.runnable import RunnablePassthrough
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 import structlog
 from dateutil import parser
-import pytz
 import parsedatetime
 from config import config
-from calendar_utils import calendar_api
+from calendar_utils import calendar_api, parse_gcal_ts
 
 logger = structlog.get_logger(__name__)
 cal = parsedatetime.Calendar()
 
 def parse_natural_date(date_str):
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    if _is_time_relative(date_str):
+        return _parse_natural_date(date_str)
+    return _parse_natural_date_cached(date_str, date.today().toordinal())
+
+_RELATIVE_PROBE_TIME = datetime(2000, 1, 3, 12, 0)
+
+@lru_cache(maxsize=2048)
+def _is_time_relative(date_str):
+    # Phrases like "now" or "in 2 hours" move with the clock, so they resolve differently a minute later.
+    try:
+        probe = cal.parse(date_str, sourceTime=_RELATIVE_PROBE_TIME.timetuple())[0][:6]
+        shifted = cal.parse(date_str, sourceTime=(_RELATIVE_PROBE_TIME + timedelta(minutes=1)).timetuple())[0][:6]
+        return probe != shifted
+    except Exception:
+        return True
+
+@lru_cache(maxsize=2048)
+def _parse_natural_date_cached(date_str, today_ordinal):
+    # today_ordinal only scopes the cache to the current day, so "tomorrow" is re-resolved after midnight.
+    return _parse_natural_date(date_str)
+
+def _parse_natural_date(date_str):
     try:
         time_struct, parse_status = cal.parse(date_str)
         if parse_status == 0:
-            logger.debug("parsedatetime failed, using dateutil.parser", date_str=date_str)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("parsedatetime failed, using dateutil.parser", date_str=date_str)
             return parser.parse(date_str)
-        logger.debug("parsedatetime succeeded", date_str=date_str, time_struct=time_struct)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("parsedatetime succeeded", date_str=date_str, time_struct=time_struct)
         return datetime(*time_struct[:6])
     except Exception as e:
         logger.error("Error parsing date", error=str(e), date_str=date_str)
         return parser.parse(date_str)
 
+class CheckAvailabilityArgs(BaseModel):
+    date_str: str = Field(description="Date to check, e.g. '2024-05-12' or 'next Wednesday'")
+    start_time: str = Field(default="09:00", description="Start of the time range, e.g. '09:00'")
+    end_time: str = Field(default="17:00", description="End of the time range, e.g. '17:00'")
+
 class CheckAvailabilityTool(BaseTool):
     name: str = "check_availability"
     description: str = "Check calendar availability for a specific date and time range. Use this when the user asks about their schedule or availability."
+    args_schema: Type[BaseModel] = CheckAvailabilityArgs
 
     def _run(self, date_str: str, start_time: str = "09:00", end_time: str = "17:00") -> str:
         
         try:
             start_datetime = parse_natural_date(f"{date_str} {start_time}")
             end_datetime = parse_natural_date(f"{date_str} {end_time}")
-            logger.debug("Checking availability", start_datetime=start_datetime, end_datetime=end_datetime)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking availability", start_datetime=start_datetime, end_datetime=end_datetime)
             busy_periods = calendar_api.check_availability(start_datetime, end_datetime)
-            if not busy_periods:
-                return f"You are completely free on {date_str} from {start_time} to {end_time}."
-            busy_info = []
-            for period in busy_periods:
-                start = datetime.fromisoformat(period['start'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(period['end'].replace('Z', '+00:00'))
-                busy_info.append(f"{start.strftime('%H:%M')} - {end.strftime('%H:%M')}")
-            return f"You have {len(busy_periods)} busy periods on {date_str}: " + "; ".join(busy_info)
+            return self._format(busy_periods, date_str, start_time, end_time)
         except Exception as e:
             logger.error("Error checking availability", error=str(e))
             return f"Sorry, I couldn't check your availability for {date_str}. Please try again."
 
+    async def _arun(self, date_str: str, start_time: str = "09:00", end_time: str = "17:00") -> str:
+        try:
+            start_datetime = parse_natural_date(f"{date_str} {start_time}")
+            end_datetime = parse_natural_date(f"{date_str} {end_time}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking availability", start_datetime=start_datetime, end_datetime=end_datetime)
+            busy_periods = await calendar_api.acheck_availability(start_datetime, end_datetime)
+            return self._format(busy_periods, date_str, start_time, end_time)
+        except Exception as e:
+            logger.error("Error checking availability", error=str(e))
+            return f"Sorry, I couldn't check your availability for {date_str}. Please try again."
+
+    @staticmethod
+    def _format(busy_periods: List[Dict], date_str: str, start_time: str, end_time: str) -> str:
+        if not busy_periods:
+            return f"You are completely free on {date_str} from {start_time} to {end_time}."
+        busy_info = []
+        for period in busy_periods:
+            # freeBusy answers in UTC; every caller (single-day, multi-day, fast route) is shown local time.
+            start = parse_gcal_ts(period['start']).astimezone(config.TZ)
+            end = parse_gcal_ts(period['end']).astimezone(config.TZ)
+            busy_info.append(f"{start.strftime('%H:%M')} - {end.strftime('%H:%M')}")
+        return f"You have {len(busy_periods)} busy periods on {date_str}: " + "; ".join(busy_info)
+
+class CheckMultiDayAvailabilityArgs(BaseModel):
+    dates: List[str] = Field(description="Dates to check, e.g. ['Monday', 'Tuesday'] or ['2024-05-12', '2024-05-13']")
+    start_time: str = Field(default="09:00", description="Start of the time range on each date, e.g. '09:00'")
+    end_time: str = Field(default="17:00", description="End of the time range on each date, e.g. '17:00'")
+
+class CheckMultiDayAvailabilityTool(BaseTool):
+    name: str = "check_multi_day_availability"
+    description: str = "Check calendar availability for several dates at once within the same time range. Use this when the user asks about more than one day, e.g. 'am I free Monday, Tuesday or Wednesday?'."
+    args_schema: Type[BaseModel] = CheckMultiDayAvailabilityArgs
+
+    def _run(self, dates: List[str], start_time: str = "09:00", end_time: str = "17:00") -> str:
+        try:
+            ranges = self._parse_ranges(dates, start_time, end_time)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking multi-day availability", ranges=ranges)
+            busy_by_date = calendar_api.check_availability_batch(ranges)
+            return self._format(dates, busy_by_date, start_time, end_time)
+        except Exception as e:
+            logger.error("Error checking multi-day availability", error=str(e))
+            return f"Sorry, I couldn't check your availability for {', '.join(dates)}. Please try again."
+
+    async def _arun(self, dates: List[str], start_time: str = "09:00", end_time: str = "17:00") -> str:
+        try:
+            ranges = self._parse_ranges(dates, start_time, end_time)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking multi-day availability", ranges=ranges)
+            busy_by_date = await calendar_api.acheck_availability_batch(ranges)
+            return self._format(dates, busy_by_date, start_time, end_time)
+        except Exception as e:
+            logger.error("Error checking multi-day availability", error=str(e))
+            return f"Sorry, I couldn't check your availability for {', '.join(dates)}. Please try again."
+
+    @staticmethod
+    def _parse_ranges(dates: List[str], start_time: str, end_time: str) -> List[Tuple[datetime, datetime]]:
+        return [
+            (parse_natural_date(f"{date_str} {start_time}"), parse_natural_date(f"{date_str} {end_time}"))
+            for date_str in dates
+        ]
+
+    @staticmethod
+    def _format(dates: List[str], busy_by_date: List[List[Dict]], start_time: str, end_time: str) -> str:
+        return "\n".join(
+            CheckAvailabilityTool._format(busy_periods, date_str, start_time, end_time)
+            for date_str, busy_periods in zip(dates, busy_by_date)
+        )
+
+class SuggestSlotsArgs(BaseModel):
+    date_str: str = Field(description="Date to find slots on, e.g. '2024-05-12' or 'tomorrow'")
+    duration_minutes: int = Field(default=60, description="Meeting length in minutes")
+
 class SuggestSlotsTool(BaseTool):
     name: str = "suggest_available_slots"
     description: str = "Suggest available time slots for a given date and meeting duration. Use this when the user wants to book a meeting but doesn't specify a time."
+    args_schema: Type[BaseModel] = SuggestSlotsArgs
 
     def _run(self, date_str: str, duration_minutes: int = 60) -> str:
         try:
             target_date = parse_natural_date(date_str)
-            logger.debug("Suggesting slots", target_date=target_date, duration_minutes=duration_minutes)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Suggesting slots", target_date=target_date, duration_minutes=duration_minutes)
             available_slots = calendar_api.suggest_available_slots(
                 target_date, 
                 duration_minutes=duration_minutes
             )
-            if not available_slots:
-                return f"No available slots found for {date_str} with a {duration_minutes}-minute meeting."
-            slot_info = []
-            for i, slot in enumerate(available_slots[:5], 1):
-                start_time = datetime.fromisoformat(slot['start'])
-                end_time = datetime.fromisoformat(slot['end'])
-                slot_info.append(f"{i}. {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}")
-            return f"Available {duration_minutes}-minute slots on {date_str}:\n" + "\n".join(slot_info)
+            return self._format(available_slots, date_str, duration_minutes)
         except Exception as e:
             logger.error("Error suggesting slots", error=str(e))
             return f"Sorry, I couldn't find available slots for {date_str}. Please try again."
 
+    async def _arun(self, date_str: str, duration_minutes: int = 60) -> str:
+        try:
+            target_date = parse_natural_date(date_str)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Suggesting slots", target_date=target_date, duration_minutes=duration_minutes)
+            available_slots = await calendar_api.asuggest_available_slots(
+                target_date,
+                duration_minutes=duration_minutes
+            )
+            return self._format(available_slots, date_str, duration_minutes)
+        except Exception as e:
+            logger.error("Error suggesting slots", error=str(e))
+            return f"Sorry, I couldn't find available slots for {date_str}. Please try again."
+
+    @staticmethod
+    def _format(available_slots: List[Dict], date_str: str, duration_minutes: int) -> str:
+        if not available_slots:
+            return f"No available slots found for {date_str} with a {duration_minutes}-minute meeting."
+        slot_info = []
+        for i, slot in enumerate(available_slots[:5], 1):
+            start_time = datetime.fromisoformat(slot['start'])
+            end_time = datetime.fromisoformat(slot['end'])
+            slot_info.append(f"{i}. {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}")
+        return f"Available {duration_minutes}-minute slots on {date_str}:\n" + "\n".join(slot_info)
+
+class BookEventArgs(BaseModel):
+    title: str = Field(description="Title of the event")
+    start_time_str: str = Field(description="Start date and time, e.g. '2024-05-12 15:00'")
+    end_time_str: str = Field(description="End date and time, e.g. '2024-05-12 16:00'")
+    description: str = Field(default="", description="Optional event description")
+
 class BookEventTool(BaseTool):
     name: str = "book_event"
     description: str = "Book an event in the calendar. Use this when the user confirms they want to book a specific time slot."
+    args_schema: Type[BaseModel] = BookEventArgs
 
     def _run(self, title: str, start_time_str: str, end_time_str: str, description: str = "") -> str:
         try:
             start_time = parse_natural_date(start_time_str)
             end_time = parse_natural_date(end_time_str)
-            logger.debug("Booking event", title=title, start_time=start_time, end_time=end_time, description=description)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Booking event", title=title, start_time=start_time, end_time=end_time, description=description)
             event = calendar_api.book_event(
                 title=title,
                 start_time=start_time,
                 end_time=end_time,
                 description=description
             )
-            return f"✅ Successfully booked '{title}' from {start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%H:%M')}. Event ID: {event['id']}"
+            return self._format(event, title, start_time, end_time)
+        except Exception as e:
+            logger.error("Error booking event", error=str(e))
+            return f"Sorry, I couldn't book the event '{title}'. Please try again."
+
+    async def _arun(self, title: str, start_time_str: str, end_time_str: str, description: str = "") -> str:
+        try:
+            start_time = parse_natural_date(start_time_str)
+            end_time = parse_natural_date(end_time_str)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Booking event", title=title, start_time=start_time, end_time=end_time, description=description)
+            event = await calendar_api.abook_event(
+                title=title,
+                start_time=start_time,
+                end_time=end_time,
+                description=description
+            )
+            return self._format(event, title, start_time, end_time)
         except Exception as e:
             logger.error("Error booking event", error=str(e))
             return f"Sorry, I couldn't book the event '{title}'. Please try again."
 
+    @staticmethod
+    def _format(event: Dict, title: str, start_time: datetime, end_time: datetime) -> str:
+        return f"✅ Successfully booked '{title}' from {start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%H:%M')}. Event ID: {event['id']}"
+
+class GetEventsArgs(BaseModel):
+    date_str: str = Field(description="Date to list events for, e.g. '2024-05-12' or 'today'")
+
 class GetEventsTool(BaseTool):
     name: str = "get_events"
     description: str = "Get all events for a specific date. Use this when the user asks about their schedule for a particular day."
+    args_schema: Type[BaseModel] = GetEventsArgs
 
     def _run(self, date_str: str) -> str:
         try:
             target_date = parse_natural_date(date_str)
-            logger.debug("Getting events for date", target_date=target_date)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Getting events for date", target_date=target_date)
             events = calendar_api.get_events_for_date(target_date)
-            if not events:
-                return f"You have no events scheduled for {date_str}."
-            event_info = []
-            for event in events:
-                start = datetime.fromisoformat(event['start'])
-                end = datetime.fromisoformat(event['end'])
-                event_info.append(f"• {event['title']} ({start.strftime('%H:%M')} - {end.strftime('%H:%M')})")
-            return f"Events for {date_str}:\n" + "\n".join(event_info)
+            return self._format(events, date_str)
         except Exception as e:
             logger.error("Error getting events", error=str(e))
             return f"Sorry, I couldn't retrieve your events for {date_str}. Please try again."
 
+    async def _arun(self, date_str: str) -> str:
+        try:
+            target_date = parse_natural_date(date_str)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Getting events for date", target_date=target_date)
+            events = await calendar_api.aget_events_for_date(target_date)
+            return self._format(events, date_str)
+        except Exception as e:
+            logger.error("Error getting events", error=str(e))
+            return f"Sorry, I couldn't retrieve your events for {date_str}. Please try again."
+
+    @staticmethod
+    def _format(events: List[Dict], date_str: str) -> str:
+        if not events:
+            return f"You have no events scheduled for {date_str}."
+        event_info = []
+        for event in events:
+            start = parse_gcal_ts(event['start'])
+            end = parse_gcal_ts(event['end'])
+            event_info.append(f"• {event['title']} ({start.strftime('%H:%M')} - {end.strftime('%H:%M')})")
+        return f"Events for {date_str}:\n" + "\n".join(event_info)
+
+_SYSTEM_PROMPT = (
+    "You are a helpful AI assistant that helps users book appointments and manage their Google Calendar.\n\n"
+    "You have access to the following tools and must use them to interact with the user's Google Calendar:\n"
+    "- check_availability: Check calendar availability for a specific date and time range.\n"
+    "- check_multi_day_availability: Check calendar availability for several dates at once.\n"
+    "- suggest_available_slots: Suggest available time slots for a given date and meeting duration.\n"
+    "- book_event: Book an event in the calendar.\n"
+    "- get_events: Get all events for a specific date.\n\n"
+    "If a user asks to book, check, or view events, always use the appropriate tool.\n"
+    "When the user asks about more than one date, use check_multi_day_availability instead of calling check_availability once per date.\n\n"
+    "Your capabilities include:\n"
+    "- Checking calendar availability for specific dates and times\n"
+    "- Suggesting available time slots for meetings\n"
+    "- Booking events in the calendar\n"
+    "- Retrieving events for specific dates\n\n"
+    "Guidelines:\n"
+    "1. Always be polite and helpful\n"
+    "2. When users want to book a meeting but don't specify a time, suggest available slots\n"
+    "3. Confirm details before booking (title, time, duration)\n"
+    "4. If information is missing, ask clarifying questions\n"
+    "5. Use natural language in your responses\n"
+    "6. When booking events, always confirm the details with the user first\n\n"
+    "Example interactions:\n"
+    "- User: 'Book a meeting for tomorrow at 3 PM' → Check availability, confirm details, then book\n"
+    "- User: 'Do I have time next Wednesday?' → Check availability and report back\n"
+    "- User: 'I want to schedule a call' → Ask for date, time, and duration, then suggest slots\n\n"
+    "Remember to use the appropriate tools for each task and provide clear, helpful responses."
+)
+
+_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", _SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("human", "{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad"),
+])
+
+# Single-turn lookups that map directly onto one tool, answered without an LLM round-trip.
+_FAST_ROUTES = [
+    (re.compile(
+        r"^\s*(?:list|show(?:\s+me)?|what.?s)\s+(?:on\s+)?(?:my\s+)?(?:events?|schedule|calendar)\s+(?:for|on)\s+"
+        r"(?P<date>[\w\s,/-]+?)\s*[?.!]*\s*$",
+        re.IGNORECASE
+    ), "get_events"),
+    (re.compile(
+        r"^\s*am\s+i\s+(?:free|available)\s+(?:on|for)\s+(?P<date>[\w\s,/-]+?)\s*[?.!]*\s*$",
+        re.IGNORECASE
+    ), "check_availability"),
+]
+
+# Only slots that name exactly one day are routed; ranges, lists and time qualifiers go to the agent.
+_SINGLE_DAY_SLOT = re.compile(
+    r"(?:today|tomorrow|(?:(?:this|next)\s+)?(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+    r"|\d{4}-\d{2}-\d{2})",
+    re.IGNORECASE
+)
+
+# Longer histories are compacted: older turns become one summary message, the most recent stay verbatim.
+HISTORY_COMPACT_THRESHOLD = 12
+HISTORY_KEEP_RECENT = 6
+
+def _chunk_text(chunk: Any) -> str:
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+EMPTY_OBSERVATION = "No result."
+
 def filter_empty_steps(steps):
-   return [step for step in steps if step and str(step).strip() and (isinstance(step, tuple) and (str(step[0]).strip() or str(step[1]).strip()))]
+    # Every tool call in the scratchpad needs a matching tool message, so empty observations are
+    # replaced rather than dropped.
+    return [
+        (action, EMPTY_OBSERVATION if observation in (None, '') else observation)
+        for action, observation in steps
+    ]
+
+def configure_llm_cache():
+    # Exact-match only: a semantic cache would replay tool calls (e.g. book_event args) for merely similar prompts.
+    if config.LLM_CACHE_PATH:
+        set_llm_cache(SQLiteCache(database_path=config.LLM_CACHE_PATH))
+        logger.info("LLM cache enabled", database_path=config.LLM_CACHE_PATH)
 
 class CalendarAgent:
     
     def __init__(self):
        
+        configure_llm_cache()
         self.llm = ChatGoogleGenerativeAI(
             model=config.GEMINI_MODEL,
             temperature=0.1,
@@ -131,85 +389,192 @@ class CalendarAgent:
         )
         self.tools = [
             CheckAvailabilityTool(),
+            CheckMultiDayAvailabilityTool(),
             SuggestSlotsTool(),
             BookEventTool(),
             GetEventsTool()
         ]
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", self._get_system_prompt()),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"),
-        ])
-        self.agent = create_openai_functions_agent(
-            llm=self.llm,
-            tools=self.tools,
-            prompt=self.prompt
+        self.summary_llm = ChatGoogleGenerativeAI(
+            model=config.GEMINI_MODEL,
+            temperature=0,
+            google_api_key=config.GOOGLE_API_KEY,
+            convert_system_message_to_human=True
+        )
+        self._tools_by_name = {tool.name: tool for tool in self.tools}
+        self.prompt = _PROMPT_TEMPLATE
+        # Hand-built equivalent of create_tool_calling_agent, so the tool-bound model is kept on the instance.
+        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self.agent = (
+            RunnablePassthrough.assign(
+                agent_scratchpad=lambda x: format_to_tool_messages(x["intermediate_steps"])
+            )
+            | self.prompt
+            | self.llm_with_tools
+            | ToolsAgentOutputParser()
         )
         self.agent_executor = AgentExecutor(
             agent=self.agent,
             tools=self.tools,
-            verbose=True,
+            verbose=config.LOG_LEVEL == "DEBUG",
             handle_parsing_errors=True,
+            # Streaming steps bypass the LLM cache; /chat/stream still gets tokens via astream_events.
+            stream_runnable=False,
             return_intermediate_steps=True,
-            intermediate_steps_filter=filter_empty_steps
+            trim_intermediate_steps=filter_empty_steps
         )
         logger.info("Calendar agent initialized successfully")
 
-    def _get_system_prompt(self) -> str:
-        
+    def _match_fast_route(self, message: str, chat_history: List[BaseMessage]) -> Optional[Tuple[BaseTool, str]]:
+        # Follow-up messages may depend on earlier turns, so only fresh conversations are routed.
+        if chat_history:
+            return None
+        for pattern, tool_name in _FAST_ROUTES:
+            match = pattern.match(message)
+            if match and _SINGLE_DAY_SLOT.fullmatch(match.group("date")):
+                return self._tools_by_name[tool_name], match.group("date")
+        return None
+
+    @staticmethod
+    def _summary_request(messages: List[BaseMessage]) -> str:
+        transcript = "\n".join(
+            f"{'User' if message.type == 'human' else 'Assistant'}: {message.content}"
+            for message in messages
+        )
         return (
-            "You are a helpful AI assistant that helps users book appointments and manage their Google Calendar.\n\n"
-            "You have access to the following tools and must use them to interact with the user's Google Calendar:\n"
-            "- check_availability: Check calendar availability for a specific date and time range.\n"
-            "- suggest_available_slots: Suggest available time slots for a given date and meeting duration.\n"
-            "- book_event: Book an event in the calendar.\n"
-            "- get_events: Get all events for a specific date.\n\n"
-            "If a user asks to book, check, or view events, always use the appropriate tool.\n\n"
-            "Your capabilities include:\n"
-            "- Checking calendar availability for specific dates and times\n"
-            "- Suggesting available time slots for meetings\n"
-            "- Booking events in the calendar\n"
-            "- Retrieving events for specific dates\n\n"
-            "Guidelines:\n"
-            "1. Always be polite and helpful\n"
-            "2. When users want to book a meeting but don't specify a time, suggest available slots\n"
-            "3. Confirm details before booking (title, time, duration)\n"
-            "4. If information is missing, ask clarifying questions\n"
-            "5. Use natural language in your responses\n"
-            "6. When booking events, always confirm the details with the user first\n\n"
-            "Example interactions:\n"
-            "- User: 'Book a meeting for tomorrow at 3 PM' → Check availability, confirm details, then book\n"
-            "- User: 'Do I have time next Wednesday?' → Check availability and report back\n"
-            "- User: 'I want to schedule a call' → Ask for date, time, and duration, then suggest slots\n\n"
-            "Remember to use the appropriate tools for each task and provide clear, helpful responses."
+            "Summarize this conversation between a user and a calendar assistant in a few sentences. "
+            "Keep every date, time, duration, event title and decision that was mentioned.\n\n"
+            + transcript
         )
 
+    def _compact(self, chat_history: List[BaseMessage]) -> List[BaseMessage]:
+        if len(chat_history) <= HISTORY_COMPACT_THRESHOLD:
+            return chat_history
+        older, recent = chat_history[:-HISTORY_KEEP_RECENT], chat_history[-HISTORY_KEEP_RECENT:]
+        try:
+            summary = _chunk_text(self.summary_llm.invoke(self._summary_request(older)))
+        except Exception as e:
+            # Dropping the older turns would silently lose context, so fall back to the full history.
+            logger.warning("Error summarizing chat history, keeping it uncompacted", error=str(e))
+            return chat_history
+        return [SystemMessage(content=f"Earlier: {summary}")] + recent
+
+    async def _acompact(self, chat_history: List[BaseMessage]) -> List[BaseMessage]:
+        if len(chat_history) <= HISTORY_COMPACT_THRESHOLD:
+            return chat_history
+        older, recent = chat_history[:-HISTORY_KEEP_RECENT], chat_history[-HISTORY_KEEP_RECENT:]
+        try:
+            summary = _chunk_text(await self.summary_llm.ainvoke(self._summary_request(older)))
+        except Exception as e:
+            # Dropping the older turns would silently lose context, so fall back to the full history.
+            logger.warning("Error summarizing chat history, keeping it uncompacted", error=str(e))
+            return chat_history
+        return [SystemMessage(content=f"Earlier: {summary}")] + recent
+
     def process_message(self, message: str, chat_history: List[BaseMessage] = None) -> str:
         try:
             if chat_history is None:
                 chat_history = []
             if not message.strip():
                 return "Please provide a message first."
-            logger.debug("Processing message", message=message, chat_history=chat_history)
+            route = self._match_fast_route(message, chat_history)
+            if route:
+                tool, date_str = route
+                logger.info("Answering via fast route", tool=tool.name)
+                return tool._run(date_str)
+            chat_history = self._compact(chat_history)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processing message", message=message, chat_history=chat_history)
             response = self.agent_executor.invoke({
                 "input": message,
                 "chat_history": chat_history
             })
-            if isinstance(response, dict):
-                output = response.get('output', '') or ''
-                if output.strip() and "Encountered an error processing your request." not in output:
-                    return output
-                steps = response.get('intermediate_steps', [])
-                if steps:
-                    last_step = steps[-1]
-                    if isinstance(last_step, tuple) and len(last_step) == 2:
-                        observation = last_step[1]
-                        if observation and str(observation).strip():
-                            return str(observation)
+            return self._extract_output(response)
+        except Exception as e:
+            logger.error("Error processing message", error=str(e))
             return "Network Error"
+
+    async def aprocess_message(self, message: str, chat_history: List[BaseMessage] = None) -> str:
+        try:
+            if chat_history is None:
+                chat_history = []
+            if not message.strip():
+                return "Please provide a message first."
+            route = self._match_fast_route(message, chat_history)
+            if route:
+                tool, date_str = route
+                logger.info("Answering via fast route", tool=tool.name)
+                return await tool._arun(date_str)
+            chat_history = await self._acompact(chat_history)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processing message", message=message, chat_history=chat_history)
+            response = await self.agent_executor.ainvoke({
+                "input": message,
+                "chat_history": chat_history
+            })
+            return self._extract_output(response)
         except Exception as e:
             logger.error("Error processing message", error=str(e))
             return "Network Error"
 
+    async def astream(self, message: str, chat_history: List[BaseMessage] = None) -> AsyncIterator[str]:
+        if chat_history is None:
+            chat_history = []
+        if not message.strip():
+            yield "Please provide a message first."
+            return
+        route = self._match_fast_route(message, chat_history)
+        if route:
+            tool, date_str = route
+            logger.info("Answering via fast route", tool=tool.name)
+            yield await tool._arun(date_str)
+            return
+        chat_history = await self._acompact(chat_history)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Streaming message", message=message, chat_history=chat_history)
+        streamed = False
+        streamed_runs = set()
+        last_observation = None
+        try:
+            async for event in self.agent_executor.astream_events({
+                "input": message,
+                "chat_history": chat_history
+            }, version="v2"):
+                if event["event"] == "on_chat_model_stream":
+                    text = _chunk_text(event["data"]["chunk"])
+                    if text:
+                        streamed = True
+                        streamed_runs.add(event["run_id"])
+                        yield text
+                elif event["event"] == "on_chat_model_end" and event["run_id"] not in streamed_runs:
+                    # Cached completions arrive whole, without any stream events.
+                    text = _chunk_text(event["data"]["output"])
+                    if text:
+                        streamed = True
+                        yield text
+                elif event["event"] == "on_tool_end":
+                    output = event["data"].get("output")
+                    last_observation = getattr(output, "content", output)
+        except Exception as e:
+            logger.error("Error streaming message", error=str(e))
+        if not streamed:
+            if last_observation and str(last_observation).strip():
+                yield str(last_observation)
+            else:
+                yield "Network Error"
+
+    @staticmethod
+    def _extract_output(response: Any) -> str:
+        if isinstance(response, dict):
+            output = response.get('output', '') or ''
+            if output.strip() and "Encountered an error processing your request." not in output:
+                return output
+            steps = response.get('intermediate_steps', [])
+            if steps:
+                last_step = steps[-1]
+                if isinstance(last_step, tuple) and len(last_step) == 2:
+                    observation = last_step[1]
+                    if observation and str(observation).strip():
+                        return str(observation)
+        return "Network Error"
+
 agent = CalendarAgent() 
\ No newline at end of file
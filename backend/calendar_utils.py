@@ -3,51 +3,357 @@ Google Calendar API utilities for the Calendar Booking Agent.
 Handles calendar operations like checking availability, suggesting slots, and booking events.
 """
 
+import asyncio
+import json
+import os
+import threading
 from datetime import datetime, timedelta, time
 from typing import List, Dict, Optional, Tuple
-import pytz
+from urllib.parse import quote
+import httpx
+from cachetools import TTLCache
+import google.auth.transport.requests
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 import structlog
 from config import config
 
 logger = structlog.get_logger(__name__)
 
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+# The Calendar API rejects batch requests with more than 50 calls.
+BATCH_LIMIT = 50
+# Partial-response mask for events.list: only the fields _format_events reads.
+EVENT_LIST_FIELDS = 'items(id,summary,start,end,description),nextPageToken'
+EVENT_LIST_PAGE_SIZE = 250
+
+# One pooled HTTP/2 client shared by every async Calendar request, so calls reuse TCP/TLS connections.
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+)
+
+async def aclose_http_client() -> None:
+    await _client.aclose()
+
+def parse_gcal_ts(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp from the Calendar API, including the 'Z' UTC suffix."""
+    return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+
+class FreeBusyCache:
+    """
+    Short-lived cache for freeBusy responses, keyed by calendar and time range.
+    Backed by an in-process TTLCache, and by Redis as well when REDIS_URL is set.
+    """
+
+    def __init__(self, ttl: int, redis_url: str = ""):
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=1024, ttl=ttl)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._aredis = None
+        if redis_url:
+            import redis
+            import redis.asyncio
+            self._redis = redis.Redis.from_url(redis_url)
+            self._aredis = redis.asyncio.Redis.from_url(redis_url)
+
+    @staticmethod
+    def key(calendar_id: str, time_min: str, time_max: str) -> str:
+        return f"freebusy:{calendar_id}:{time_min}:{time_max}"
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            busy_periods = self._local.get(key)
+        if busy_periods is None and self._redis is not None:
+            try:
+                cached = self._redis.get(key)
+            except Exception as e:
+                logger.warning("Redis free/busy lookup failed", error=str(e))
+                return None
+            if cached is not None:
+                busy_periods = json.loads(cached)
+                with self._lock:
+                    self._local[key] = busy_periods
+        return busy_periods
+
+    async def aget(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            busy_periods = self._local.get(key)
+        if busy_periods is None and self._aredis is not None:
+            try:
+                cached = await self._aredis.get(key)
+            except Exception as e:
+                logger.warning("Redis free/busy lookup failed", error=str(e))
+                return None
+            if cached is not None:
+                busy_periods = json.loads(cached)
+                with self._lock:
+                    self._local[key] = busy_periods
+        return busy_periods
+
+    def set(self, key: str, busy_periods: List[Dict]) -> None:
+        with self._lock:
+            self._local[key] = busy_periods
+        if self._redis is not None:
+            try:
+                self._redis.set(key, json.dumps(busy_periods), ex=self.ttl)
+            except Exception as e:
+                logger.warning("Redis free/busy store failed", error=str(e))
+
+    async def aset(self, key: str, busy_periods: List[Dict]) -> None:
+        with self._lock:
+            self._local[key] = busy_periods
+        if self._aredis is not None:
+            try:
+                await self._aredis.set(key, json.dumps(busy_periods), ex=self.ttl)
+            except Exception as e:
+                logger.warning("Redis free/busy store failed", error=str(e))
+
+    def invalidate(self, calendar_id: str) -> None:
+        with self._lock:
+            self._local.clear()
+        if self._redis is not None:
+            try:
+                keys = list(self._redis.scan_iter(match=self.key(calendar_id, "*", "*")))
+                if keys:
+                    self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning("Redis free/busy invalidation failed", error=str(e))
+
+    async def ainvalidate(self, calendar_id: str) -> None:
+        with self._lock:
+            self._local.clear()
+        if self._aredis is not None:
+            try:
+                keys = [key async for key in self._aredis.scan_iter(match=self.key(calendar_id, "*", "*"))]
+                if keys:
+                    await self._aredis.delete(*keys)
+            except Exception as e:
+                logger.warning("Redis free/busy invalidation failed", error=str(e))
+
+_fb_cache = FreeBusyCache(ttl=config.FREEBUSY_CACHE_TTL, redis_url=config.REDIS_URL)
+
 class GoogleCalendarAPI:
     def __init__(self):
         
         self.calendar_id = config.get_calendar_id()
-        self.timezone = pytz.timezone(config.TIMEZONE)
+        self.tz = config.TZ
+        self._token_lock = threading.Lock()
         
         try:
            
-            credentials = service_account.Credentials.from_service_account_file(
+            self.credentials = service_account.Credentials.from_service_account_file(
                 config.CREDENTIALS_PATH,
                 scopes=['https://www.googleapis.com/auth/calendar']
             )
+            # The token cache path is user-wide, so cached tokens are tied to the exact account and key file.
+            self._token_owner = {
+                'service_account_email': self.credentials.service_account_email,
+                'credentials_path': str(config.CREDENTIALS_PATH.resolve()),
+                'credentials_mtime': config.CREDENTIALS_PATH.stat().st_mtime
+            }
+            self._load_cached_token()
             
-            self.service = build('calendar', 'v3', credentials=credentials)
+            # The discovery document bundled with google-api-python-client avoids a network fetch at startup.
+            self.service = build(
+                'calendar', 'v3',
+                credentials=self.credentials,
+                static_discovery=True,
+                cache_discovery=False
+            )
             logger.info("Google Calendar API initialized successfully", calendar_id=self.calendar_id)
             
         except Exception as e:
             logger.error("Failed to initialize Google Calendar API", error=str(e))
             raise
+
+    @property
+    def _events_url(self) -> str:
+        return f"{CALENDAR_API_URL}/calendars/{quote(self.calendar_id, safe='')}/events"
+
+    def _ensure_token(self) -> str:
+        """Return a valid access token, refreshing the credentials and persisting the new token if needed."""
+        with self._token_lock:
+            if not self.credentials.valid:
+                self.credentials.refresh(google.auth.transport.requests.Request())
+                self._store_cached_token()
+            return self.credentials.token
+
+    def _load_cached_token(self) -> None:
+        """Reuse an access token persisted by a previous process if it belongs to the same account and credentials file."""
+        try:
+            cached = json.loads(config.TOKEN_CACHE_PATH.read_text())
+            if cached.get('owner') != self._token_owner:
+                return
+            self.credentials.token = cached['token']
+            self.credentials.expiry = datetime.fromisoformat(cached['expiry'])
+            logger.debug("Loaded cached access token", expiry=cached['expiry'])
+        except (OSError, ValueError, KeyError):
+            return
+
+    def _store_cached_token(self) -> None:
+        try:
+            config.TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(config.TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as token_file:
+                json.dump({
+                    'owner': self._token_owner,
+                    'token': self.credentials.token,
+                    'expiry': self.credentials.expiry.isoformat()
+                }, token_file)
+        except OSError as e:
+            logger.warning("Failed to persist access token", error=str(e))
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if self.credentials.valid:
+            token = self.credentials.token
+        else:
+            token = await asyncio.to_thread(self._ensure_token)
+        return {'Authorization': f'Bearer {token}'}
+
+    def _localize(self, value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value.replace(tzinfo=self.tz)
+        return value.astimezone(self.tz)
+
+    def _freebusy_body(self, start_date: datetime, end_date: datetime) -> Dict:
+        return {
+            'timeMin': self._localize(start_date).isoformat(),
+            'timeMax': self._localize(end_date).isoformat(),
+            'items': [{'id': self.calendar_id}]
+        }
+
+    def _day_window(self, target_date: datetime, start_hour: int, end_hour: int) -> Tuple[datetime, datetime]:
+        target_date = self._localize(target_date)
+        day_start = target_date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+        day_end = target_date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
+        return day_start, day_end
+
+    def _day_bounds(self, target_date: datetime) -> Tuple[datetime, datetime]:
+        target_date = self._localize(target_date)
+        day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        return day_start, day_end
+
+    @staticmethod
+    def _merge_busy_periods(busy_periods: List[Dict]) -> List[Tuple[datetime, datetime]]:
+        """Parse busy periods once and merge them into sorted, non-overlapping intervals."""
+        intervals = sorted(
+            (parse_gcal_ts(period['start']), parse_gcal_ts(period['end']))
+            for period in busy_periods
+        )
+        merged = []
+        for busy_start, busy_end in intervals:
+            if merged and busy_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], busy_end))
+            else:
+                merged.append((busy_start, busy_end))
+        return merged
+
+    def _free_slots(self,
+                    day_start: datetime,
+                    day_end: datetime,
+                    busy_periods: List[Dict],
+                    duration_minutes: int) -> List[Dict]:
+        busy = self._merge_busy_periods(busy_periods)
+        duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=30)
+        
+        available_slots = []
+        current_time = day_start
+        busy_index = 0
+        
+        while current_time + duration <= day_end:
+            slot_end = current_time + duration
+            
+            while busy_index < len(busy) and busy[busy_index][1] <= current_time:
+                busy_index += 1
+            
+            if busy_index == len(busy) or slot_end <= busy[busy_index][0]:
+                available_slots.append({
+                    'start': current_time.isoformat(),
+                    'end': slot_end.isoformat(),
+                    'duration_minutes': duration_minutes
+                })
+                current_time += step
+            else:
+                # Jump to the first 30-minute mark at or after the end of the blocking period.
+                current_time = day_start - ((day_start - busy[busy_index][1]) // step) * step
+        
+        logger.info("Available slots suggested", 
+                   date=day_start.date().isoformat(),
+                   duration_minutes=duration_minutes,
+                   slots_count=len(available_slots))
+        
+        return available_slots
+
+    def _event_body(self,
+                    title: str,
+                    start_time: datetime,
+                    end_time: datetime,
+                    description: str = "",
+                    attendees: List[str] = None) -> Dict:
+        event_body = {
+            'summary': title,
+            'description': description,
+            'start': {
+                'dateTime': self._localize(start_time).isoformat(),
+                'timeZone': config.TIMEZONE,
+            },
+            'end': {
+                'dateTime': self._localize(end_time).isoformat(),
+                'timeZone': config.TIMEZONE,
+            },
+        }
+        
+        if attendees:
+            event_body['attendees'] = [{'email': email} for email in attendees]
+        
+        return event_body
+
+    @staticmethod
+    def _format_booked_event(event: Dict) -> Dict:
+        return {
+            'id': event['id'],
+            'title': event['summary'],
+            'start_time': event['start']['dateTime'],
+            'end_time': event['end']['dateTime'],
+            'html_link': event['htmlLink']
+        }
+
+    @staticmethod
+    def _format_events(events: List[Dict]) -> List[Dict]:
+        formatted_events = []
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            end = event['end'].get('dateTime', event['end'].get('date'))
+            
+            formatted_events.append({
+                'id': event['id'],
+                'title': event['summary'],
+                'start': start,
+                'end': end,
+                'description': event.get('description', '')
+            })
+        return formatted_events
     
     def check_availability(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         
         try:
-            time_min = start_date.isoformat() + 'Z'
-            time_max = end_date.isoformat() + 'Z'
-            
-            body = {
-                'timeMin': time_min,
-                'timeMax': time_max,
-                'items': [{'id': self.calendar_id}]
-            }
+            body = self._freebusy_body(start_date, end_date)
+            cache_key = _fb_cache.key(self.calendar_id, body['timeMin'], body['timeMax'])
+            busy_periods = _fb_cache.get(cache_key)
+            if busy_periods is not None:
+                return busy_periods
             
+            self._ensure_token()
             events_result = self.service.freebusy().query(body=body).execute()
             busy_periods = events_result['calendars'][self.calendar_id]['busy']
+            _fb_cache.set(cache_key, busy_periods)
             
             logger.info("Availability checked", 
                        start_date=start_date.isoformat(),
@@ -59,6 +365,75 @@ class GoogleCalendarAPI:
         except HttpError as e:
             logger.error("Failed to check availability", error=str(e))
             raise
+
+    async def acheck_availability(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+        
+        try:
+            body = self._freebusy_body(start_date, end_date)
+            cache_key = _fb_cache.key(self.calendar_id, body['timeMin'], body['timeMax'])
+            busy_periods = await _fb_cache.aget(cache_key)
+            if busy_periods is not None:
+                return busy_periods
+            
+            response = await _client.post(
+                f"{CALENDAR_API_URL}/freeBusy",
+                json=body,
+                headers=await self._auth_headers()
+            )
+            response.raise_for_status()
+            busy_periods = response.json()['calendars'][self.calendar_id]['busy']
+            await _fb_cache.aset(cache_key, busy_periods)
+            
+            logger.info("Availability checked", 
+                       start_date=start_date.isoformat(),
+                       end_date=end_date.isoformat(),
+                       busy_periods_count=len(busy_periods))
+            
+            return busy_periods
+            
+        except httpx.HTTPError as e:
+            logger.error("Failed to check availability", error=str(e))
+            raise
+    
+    def check_availability_batch(self, ranges: List[Tuple[datetime, datetime]]) -> List[List[Dict]]:
+        
+        if not ranges:
+            return []
+        busy_periods = self.check_availability(
+            min(self._localize(start) for start, _ in ranges),
+            max(self._localize(end) for _, end in ranges)
+        )
+        return self._split_busy_periods(ranges, busy_periods)
+
+    async def acheck_availability_batch(self, ranges: List[Tuple[datetime, datetime]]) -> List[List[Dict]]:
+        
+        if not ranges:
+            return []
+        busy_periods = await self.acheck_availability(
+            min(self._localize(start) for start, _ in ranges),
+            max(self._localize(end) for _, end in ranges)
+        )
+        return self._split_busy_periods(ranges, busy_periods)
+
+    def _split_busy_periods(self,
+                            ranges: List[Tuple[datetime, datetime]],
+                            busy_periods: List[Dict]) -> List[List[Dict]]:
+        """Bucket busy periods from one bounding freeBusy query into the requested ranges."""
+        # freeBusy answers in UTC; convert once so clipped bounds and their formatting are in local time.
+        parsed = [
+            (parse_gcal_ts(period['start']).astimezone(self.tz), parse_gcal_ts(period['end']).astimezone(self.tz))
+            for period in busy_periods
+        ]
+        buckets = []
+        for range_start, range_end in ranges:
+            range_start = self._localize(range_start)
+            range_end = self._localize(range_end)
+            buckets.append([
+                {'start': max(busy_start, range_start).isoformat(), 'end': min(busy_end, range_end).isoformat()}
+                for busy_start, busy_end in parsed
+                if busy_start < range_end and busy_end > range_start
+            ])
+        return buckets
     
     def suggest_available_slots(self, 
                               target_date: datetime, 
@@ -67,47 +442,24 @@ class GoogleCalendarAPI:
                               end_hour: int = 17) -> List[Dict]:
        
         try:
-            target_date = self.timezone.localize(target_date)
-            
-            day_start = target_date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-            day_end = target_date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
-            
+            day_start, day_end = self._day_window(target_date, start_hour, end_hour)
             busy_periods = self.check_availability(day_start, day_end)
+            return self._free_slots(day_start, day_end, busy_periods, duration_minutes)
             
-            available_slots = []
-            current_time = day_start
-            
-            while current_time + timedelta(minutes=duration_minutes) <= day_end:
-                slot_end = current_time + timedelta(minutes=duration_minutes)
-                
-                is_available = True
-                for busy_period in busy_periods:
-                    busy_start = datetime.fromisoformat(busy_period['start'].replace('Z', '+00:00'))
-                    busy_end = datetime.fromisoformat(busy_period['end'].replace('Z', '+00:00'))
-                    
-                    busy_start = busy_start.astimezone(self.timezone)
-                    busy_end = busy_end.astimezone(self.timezone)
-                    
-                    if (current_time < busy_end and slot_end > busy_start):
-                        is_available = False
-                        break
-                
-                if is_available:
-                    available_slots.append({
-                        'start': current_time.isoformat(),
-                        'end': slot_end.isoformat(),
-                        'duration_minutes': duration_minutes
-                    })
-                
-                
-                current_time += timedelta(minutes=30)
-            
-            logger.info("Available slots suggested", 
-                       date=target_date.date().isoformat(),
-                       duration_minutes=duration_minutes,
-                       slots_count=len(available_slots))
-            
-            return available_slots
+        except Exception as e:
+            logger.error("Failed to suggest available slots", error=str(e))
+            raise
+
+    async def asuggest_available_slots(self, 
+                                       target_date: datetime, 
+                                       duration_minutes: int = 60,
+                                       start_hour: int = 9,
+                                       end_hour: int = 17) -> List[Dict]:
+       
+        try:
+            day_start, day_end = self._day_window(target_date, start_hour, end_hour)
+            busy_periods = await self.acheck_availability(day_start, day_end)
+            return self._free_slots(day_start, day_end, busy_periods, duration_minutes)
             
         except Exception as e:
             logger.error("Failed to suggest available slots", error=str(e))
@@ -121,84 +473,86 @@ class GoogleCalendarAPI:
                    attendees: List[str] = None) -> Dict:
         
         try:
-            if start_time.tzinfo is None:
-                start_time = self.timezone.localize(start_time)
-            if end_time.tzinfo is None:
-                end_time = self.timezone.localize(end_time)
-            
-            event_body = {
-                'summary': title,
-                'description': description,
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': config.TIMEZONE,
-                },
-                'end': {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': config.TIMEZONE,
-                },
-            }
-            
-            
-            if attendees:
-                event_body['attendees'] = [{'email': email} for email in attendees]
+            event_body = self._event_body(title, start_time, end_time, description, attendees)
             
+            self._ensure_token()
             event = self.service.events().insert(
                 calendarId=self.calendar_id,
                 body=event_body
             ).execute()
+            _fb_cache.invalidate(self.calendar_id)
             
             logger.info("Event booked successfully", 
                        event_id=event['id'],
                        title=title,
-                       start_time=start_time.isoformat(),
-                       end_time=end_time.isoformat())
+                       start_time=event_body['start']['dateTime'],
+                       end_time=event_body['end']['dateTime'])
             
-            return {
-                'id': event['id'],
-                'title': event['summary'],
-                'start_time': event['start']['dateTime'],
-                'end_time': event['end']['dateTime'],
-                'html_link': event['htmlLink']
-            }
+            return self._format_booked_event(event)
             
         except HttpError as e:
             logger.error("Failed to book event", error=str(e))
             raise
+
+    async def abook_event(self, 
+                          title: str, 
+                          start_time: datetime, 
+                          end_time: datetime,
+                          description: str = "",
+                          attendees: List[str] = None) -> Dict:
+        
+        try:
+            event_body = self._event_body(title, start_time, end_time, description, attendees)
+            
+            response = await _client.post(
+                self._events_url,
+                json=event_body,
+                headers=await self._auth_headers()
+            )
+            response.raise_for_status()
+            event = response.json()
+            await _fb_cache.ainvalidate(self.calendar_id)
+            
+            logger.info("Event booked successfully", 
+                       event_id=event['id'],
+                       title=title,
+                       start_time=event_body['start']['dateTime'],
+                       end_time=event_body['end']['dateTime'])
+            
+            return self._format_booked_event(event)
+            
+        except httpx.HTTPError as e:
+            logger.error("Failed to book event", error=str(e))
+            raise
     
     def get_events_for_date(self, target_date: datetime) -> List[Dict]:
         
         try:
-            target_date = self.timezone.localize(target_date)
+            day_start, day_end = self._day_bounds(target_date)
             
-            day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+            events = []
+            page_token = None
+            while True:
+                self._ensure_token()
+                events_result = self.service.events().list(
+                    calendarId=self.calendar_id,
+                    timeMin=day_start.isoformat(),
+                    timeMax=day_end.isoformat(),
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=EVENT_LIST_FIELDS,
+                    maxResults=EVENT_LIST_PAGE_SIZE,
+                    pageToken=page_token
+                ).execute()
+                events.extend(events_result.get('items', []))
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
             
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=day_start.isoformat(),
-                timeMax=day_end.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                formatted_events.append({
-                    'id': event['id'],
-                    'title': event['summary'],
-                    'start': start,
-                    'end': end,
-                    'description': event.get('description', '')
-                })
+            formatted_events = self._format_events(events)
             
             logger.info("Events retrieved for date", 
-                       date=target_date.date().isoformat(),
+                       date=day_start.date().isoformat(),
                        events_count=len(formatted_events))
             
             return formatted_events
@@ -206,14 +560,55 @@ class GoogleCalendarAPI:
         except HttpError as e:
             logger.error("Failed to get events for date", error=str(e))
             raise
-    
+
+    async def aget_events_for_date(self, target_date: datetime) -> List[Dict]:
+        
+        try:
+            day_start, day_end = self._day_bounds(target_date)
+            
+            params = {
+                'timeMin': day_start.isoformat(),
+                'timeMax': day_end.isoformat(),
+                'singleEvents': 'true',
+                'orderBy': 'startTime',
+                'fields': EVENT_LIST_FIELDS,
+                'maxResults': EVENT_LIST_PAGE_SIZE
+            }
+            events = []
+            while True:
+                response = await _client.get(
+                    self._events_url,
+                    params=params,
+                    headers=await self._auth_headers()
+                )
+                response.raise_for_status()
+                events_result = response.json()
+                events.extend(events_result.get('items', []))
+                if not events_result.get('nextPageToken'):
+                    break
+                params['pageToken'] = events_result['nextPageToken']
+            
+            formatted_events = self._format_events(events)
+            
+            logger.info("Events retrieved for date", 
+                       date=day_start.date().isoformat(),
+                       events_count=len(formatted_events))
+            
+            return formatted_events
+            
+        except httpx.HTTPError as e:
+            logger.error("Failed to get events for date", error=str(e))
+            raise
+
     def delete_event(self, event_id: str) -> bool:
         
         try:
+            self._ensure_token()
             self.service.events().delete(
                 calendarId=self.calendar_id,
                 eventId=event_id
             ).execute()
+            _fb_cache.invalidate(self.calendar_id)
             
             logger.info("Event deleted successfully", event_id=event_id)
             return True
@@ -222,4 +617,90 @@ class GoogleCalendarAPI:
             logger.error("Failed to delete event", error=str(e), event_id=event_id)
             return False
 
+    def _execute_batch(self, requests: List, callback) -> None:
+        """Send requests as multipart batches, using each request's index as its batch request id."""
+        for offset in range(0, len(requests), BATCH_LIMIT):
+            batch: BatchHttpRequest = self.service.new_batch_http_request(callback=callback)
+            for index, request in enumerate(requests[offset:offset + BATCH_LIMIT], offset):
+                batch.add(request, request_id=str(index))
+            self._ensure_token()
+            batch.execute()
+
+    def book_events_batch(self, events: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Book several events with a single batch HTTP request per 50 events.
+        Each item takes the keyword arguments of book_event; failed bookings are returned as None.
+        """
+        booked: List[Optional[Dict]] = [None] * len(events)
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                logger.error("Failed to book event", error=str(exception), title=events[int(request_id)].get('title'))
+                return
+            booked[int(request_id)] = self._format_booked_event(response)
+        
+        try:
+            requests = [
+                self.service.events().insert(calendarId=self.calendar_id, body=self._event_body(**event))
+                for event in events
+            ]
+            self._execute_batch(requests, callback)
+            _fb_cache.invalidate(self.calendar_id)
+            
+            logger.info("Events booked in batch", 
+                       requested=len(events),
+                       booked=sum(1 for event in booked if event is not None))
+            
+            return booked
+            
+        except HttpError as e:
+            logger.error("Failed to book events in batch", error=str(e))
+            raise
+
+    def delete_events_batch(self, event_ids: List[str]) -> Dict[str, bool]:
+        """Delete several events with a single batch HTTP request per 50 events."""
+        deleted = {event_id: False for event_id in event_ids}
+        
+        def callback(request_id, response, exception):
+            event_id = event_ids[int(request_id)]
+            if exception is not None:
+                logger.error("Failed to delete event", error=str(exception), event_id=event_id)
+                return
+            deleted[event_id] = True
+        
+        try:
+            requests = [
+                self.service.events().delete(calendarId=self.calendar_id, eventId=event_id)
+                for event_id in event_ids
+            ]
+            self._execute_batch(requests, callback)
+            _fb_cache.invalidate(self.calendar_id)
+            
+            logger.info("Events deleted in batch", 
+                       requested=len(event_ids),
+                       deleted=sum(deleted.values()))
+            
+            return deleted
+            
+        except HttpError as e:
+            logger.error("Failed to delete events in batch", error=str(e))
+            return deleted
+
+    async def adelete_event(self, event_id: str) -> bool:
+        
+        try:
+            response = await _client.delete(
+                f"{self._events_url}/{quote(event_id, safe='')}",
+                headers=await self._auth_headers()
+            )
+            response.raise_for_status()
+            await _fb_cache.ainvalidate(self.calendar_id)
+            
+            logger.info("Event deleted successfully", event_id=event_id)
+            return True
+            
+        except httpx.HTTPError as e:
+            logger.error("Failed to delete event", error=str(e), event_id=event_id)
+            return False
+
 calendar_api = GoogleCalendarAPI() 
\ No newline at end of file
@@ -6,46 +6,38 @@ Handles environment variables, API keys, and application settings.
 import os
 from pathlib import Path
 from typing import Optional
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 import logging
 import structlog
 
 load_dotenv()
 
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
 logger = structlog.get_logger()
 
 class Config:
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", ".llm_cache.db")
  
     CALENDAR_ID: str = os.getenv("CALENDAR_ID", "")
     TIMEZONE: str = os.getenv("TIMEZONE", "UTC")
+    TZ: ZoneInfo = ZoneInfo(TIMEZONE)
+    FREEBUSY_CACHE_TTL: int = int(os.getenv("FREEBUSY_CACHE_TTL", "30"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
 
     BACKEND_HOST: str = os.getenv("BACKEND_HOST", "127.0.0.1")
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
     FRONTEND_PORT: int = int(os.getenv("FRONTEND_PORT", "8501"))
 
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
 
     CREDENTIALS_PATH: Path = Path("../credentials/service_account.json")
+    TOKEN_CACHE_PATH: Path = Path(os.getenv(
+        "TOKEN_CACHE_PATH",
+        str(Path.home() / ".cache" / "calendar-agent" / "token.json")
+    )).expanduser()
     
     @classmethod
     def validate(cls) -> bool:
@@ -77,6 +69,26 @@ class Config:
 
 config = Config()
 
+structlog.configure(
+    processors=[
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        structlog.processors.KeyValueRenderer()
+        if config.LOG_FORMAT == "keyvalue"
+        else structlog.processors.JSONRenderer()
+    ],
+    context_class=dict,
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True,
+)
+
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -1,19 +1,24 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
+import orjson
 import structlog
 from datetime import datetime
+from langchain.schema import BaseMessage, HumanMessage, AIMessage
 
 from config import config
 from agent import agent
+from calendar_utils import aclose_http_client
 
 logger = structlog.get_logger()
 
 app = FastAPI(
     title="Calendar Booking Agent API",
     description="API for the conversational AI calendar booking agent",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -57,6 +62,12 @@ async def startup_event():
     
     logger.info("Calendar Booking Agent API started successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled Google Calendar connections on shutdown."""
+    await aclose_http_client()
+    logger.info("Calendar Booking Agent API stopped")
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
@@ -66,21 +77,28 @@ async def health_check():
         version="1.0.0"
     )
 
+def to_langchain_history(messages: Optional[List[ChatMessage]]) -> List[BaseMessage]:
+    """Convert API chat messages into LangChain messages, dropping unknown roles."""
+    chat_history = []
+    for msg in messages or []:
+        if msg.role == "user":
+            chat_history.append(HumanMessage(content=msg.content))
+        elif msg.role == "assistant":
+            chat_history.append(AIMessage(content=msg.content))
+    return chat_history
+
+async def sse_tokens(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Wrap text chunks as Server-Sent Events of the form `data: {"token": "..."}`."""
+    async for chunk in chunks:
+        yield b"data: " + orjson.dumps({"token": chunk}) + b"\n\n"
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     try:
         logger.info("Received chat request", message_length=len(request.message))
-        chat_history = []
-        if request.chat_history:
-            for msg in request.chat_history:
-                if msg.role == "user":
-                    from langchain.schema import HumanMessage
-                    chat_history.append(HumanMessage(content=msg.content))
-                elif msg.role == "assistant":
-                    from langchain.schema import AIMessage
-                    chat_history.append(AIMessage(content=msg.content))
+        chat_history = to_langchain_history(request.chat_history)
         
-        response = agent.process_message(request.message, chat_history)
+        response = await agent.aprocess_message(request.message, chat_history)
         
         logger.info("Chat request processed successfully", 
                    response_length=len(response))
@@ -94,6 +112,16 @@ async def chat(request: ChatRequest):
         logger.error("Error processing chat request", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the agent's reply as Server-Sent Events."""
+    logger.info("Received streaming chat request", message_length=len(request.message))
+    chat_history = to_langchain_history(request.chat_history)
+    return StreamingResponse(
+        sse_tokens(agent.astream(request.message, chat_history)),
+        media_type="text/event-stream"
+    )
+
 @app.get("/")
 async def root():
     
@@ -102,7 +130,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
-            "chat": "/chat"
+            "chat": "/chat",
+            "chat_stream": "/chat/stream"
         }
     }
 
@@ -1,8 +1,9 @@
 import streamlit as st
-import requests
+import atexit
+import httpx
 import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import time
 
 st.set_page_config(
@@ -12,15 +13,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-st.markdown("""
+_THEME_HTML = """
 <script>
     // Force light theme
     document.documentElement.setAttribute('data-theme', 'light');
 </script>
 <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>☆</text></svg>">
-""", unsafe_allow_html=True)
+"""
 
-st.markdown("""
+_CSS_HTML = """
 <style>
     /* Global text color fix */
     .stApp {
@@ -35,26 +36,6 @@ st.markdown("""
         margin-bottom: 2rem;
     }
     
-    .chat-message {
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        border-left: 4px solid;
-        color: #333333 !important;
-    }
-    
-    .user-message {
-        background-color: #e3f2fd;
-        border-left-color: #2196f3;
-        color: #333333 !important;
-    }
-    
-    .assistant-message {
-        background-color: #f3e5f5;
-        border-left-color: #9c27b0;
-        color: #333333 !important;
-    }
-    
     .stTextInput > div > div > input {
         border-radius: 20px;
         color: #333333 !important;
@@ -124,16 +105,39 @@ st.markdown("""
         color: #fff !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def _inject_static_assets():
+    return (_THEME_HTML, _CSS_HTML)
+
+MAX_VISIBLE_MESSAGES = 50
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+if "chat_history" not in st.session_state:
+    st.session_state.chat_history = []
+
 if "api_url" not in st.session_state:
     st.session_state.api_url = "http://localhost:8000"
 
-def send_message(message: str, chat_history: List[Dict] = None) -> str:
-    
+@st.cache_resource
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP/2 client used for every backend call."""
+    client = httpx.Client(
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        transport=httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            retries=2
+        )
+    )
+    atexit.register(client.close)
+    return client
+
+def stream_message(message: str, chat_history: List[Dict] = None) -> Iterator[str]:
+    """Yield reply tokens from the backend's /chat/stream Server-Sent Events as they arrive."""
     try:
         
         payload = {
@@ -141,32 +145,57 @@ def send_message(message: str, chat_history: List[Dict] = None) -> str:
             "chat_history": chat_history or []
         }
         
-        response = requests.post(
-            f"{st.session_state.api_url}/chat",
+        with get_client().stream(
+            "POST",
+            f"{st.session_state.api_url}/chat/stream",
             json=payload,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            return response.json()["response"]
-        else:
-            return f"Error: {response.status_code} - {response.text}"
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        ) as response:
+            if response.status_code != 200:
+                response.read()
+                yield f"Error: {response.status_code} - {response.text}"
+                return
+            for line in response.iter_lines():
+                if line.startswith("data: "):
+                    yield json.loads(line[len("data: "):])["token"]
             
-    except requests.exceptions.ConnectionError:
-        return "Error: Could not connect to the backend server. Please make sure the backend is running."
-    except requests.exceptions.Timeout:
-        return "Error: Request timed out. Please try again."
+    except httpx.ConnectError:
+        yield "Error: Could not connect to the backend server. Please make sure the backend is running."
+    except httpx.TimeoutException:
+        yield "Error: Request timed out. Please try again."
     except Exception as e:
-        return f"Error: {str(e)}"
+        yield f"Error: {str(e)}"
 
-def check_backend_health() -> bool:
+@st.cache_data(ttl=10, show_spinner=False)
+def check_backend_health(api_url: str) -> bool:
     try:
-        response = requests.get(f"{st.session_state.api_url}/health", timeout=5)
+        response = get_client().get(f"{api_url}/health", timeout=5)
         return response.status_code == 200
     except:
         return False
 
+def render_message(message: Dict) -> None:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+def _handle_user_turn(text: str) -> None:
+    """Send one user message, stream the reply, and record both in the session in the same rerun."""
+    timestamp = datetime.now().isoformat()
+    user_message = {"role": "user", "content": text, "timestamp": timestamp}
+    
+    render_message(user_message)
+    with st.chat_message("assistant"):
+        # chat_history is kept in the backend's wire format, so it is sent as-is.
+        response = st.write_stream(stream_message(text, st.session_state.chat_history))
+    
+    assistant_message = {"role": "assistant", "content": response, "timestamp": timestamp}
+    st.session_state.messages.extend((user_message, assistant_message))
+    st.session_state.chat_history.extend((user_message, assistant_message))
+
 def main():
+    theme_html, css_html = _inject_static_assets()
+    st.markdown(theme_html, unsafe_allow_html=True)
+    st.markdown(css_html, unsafe_allow_html=True)
     st.markdown('<h1 class="main-header">Calendar Booking Agent</h1>', unsafe_allow_html=True)
 
     with st.sidebar:
@@ -182,9 +211,12 @@ def main():
             st.session_state.api_url = api_url
             st.rerun()
        
-        backend_healthy = check_backend_health()
+        backend_healthy = check_backend_health(st.session_state.api_url)
         status_color = "🟢" if backend_healthy else "🔴"
         st.markdown(f"{status_color} Backend Status: {'Connected' if backend_healthy else 'Disconnected'}")
+        if st.button("🔄 Refresh status"):
+            check_backend_health.clear()
+            st.rerun()
         
         st.markdown("---")
         
@@ -199,14 +231,14 @@ def main():
         ]
         for example in examples:
             if st.button(example, key=f"example_{example}", help="Click to use this example"):
-                st.session_state.user_input = example
-                st.session_state.suggestion_submitted = True
+                st.session_state.pending_suggestion = example
                 st.rerun()
         
         st.markdown("---")
         
         if st.button("🗑️ Clear Chat", type="secondary"):
             st.session_state.messages = []
+            st.session_state.chat_history = []
             st.rerun()
         
         st.markdown('<div class="sidebar-header">ℹ️ About</div>', unsafe_allow_html=True)
@@ -234,70 +266,19 @@ def main():
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
                 submitted = st.form_submit_button("Send", use_container_width=True)
-        if submitted and user_input.strip():
-            st.session_state.messages.append({
-                "role": "user",
-                "content": user_input,
-                "timestamp": datetime.now()
-            })
-            with st.spinner("🤔 Thinking..."):
-                chat_history = []
-                for msg in st.session_state.messages[:-1]:
-                    chat_history.append({
-                        "role": msg["role"],
-                        "content": msg["content"],
-                        "timestamp": msg["timestamp"].isoformat() if msg["timestamp"] else None
-                    })
-                response = send_message(user_input, chat_history)
-                if not (st.session_state.messages and st.session_state.messages[-1]["role"] == "assistant" and st.session_state.messages[-1]["content"] == response):
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response,
-                        "timestamp": datetime.now()
-                    })
-            st.rerun()
+        pending = user_input if submitted else st.session_state.pop("pending_suggestion", None)
         
-        if st.session_state.get("suggestion_submitted", False):
-            st.session_state.suggestion_submitted = False
-            suggestion = st.session_state.get("user_input", "")
-            if suggestion.strip():
-                st.session_state.messages.append({
-                    "role": "user",
-                    "content": suggestion,
-                    "timestamp": datetime.now()
-                })
-                with st.spinner("🤔 Thinking..."):
-                    chat_history = []
-                    for msg in st.session_state.messages[:-1]:
-                        chat_history.append({
-                            "role": msg["role"],
-                            "content": msg["content"],
-                            "timestamp": msg["timestamp"].isoformat() if msg["timestamp"] else None
-                        })
-                    response = send_message(suggestion, chat_history)
-                    if not (st.session_state.messages and st.session_state.messages[-1]["role"] == "assistant" and st.session_state.messages[-1]["content"] == response):
-                        st.session_state.messages.append({
-                            "role": "assistant",
-                            "content": response,
-                            "timestamp": datetime.now()
-                        })
-                st.rerun()
-        for message in reversed(st.session_state.messages):
-            with st.container():
-                if message["role"] == "user":
-                    st.markdown(f"""
-                    <div class="chat-message user-message">
-                        <strong>You:</strong><br>
-                        {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="chat-message assistant-message">
-                        <strong>Assistant:</strong><br>
-                        {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
+        messages = st.session_state.messages
+        older_count = len(messages) - MAX_VISIBLE_MESSAGES
+        # Older messages are only sent to the browser when explicitly requested.
+        if older_count > 0 and st.toggle(f"Show {older_count} earlier messages"):
+            for message in messages[:older_count]:
+                render_message(message)
+        for message in messages[-MAX_VISIBLE_MESSAGES:]:
+            render_message(message)
+        
+        if pending and pending.strip():
+            _handle_user_turn(pending)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,21 +1,23 @@
+import importlib.util
 import subprocess
 import sys
 import time
-import os
 from pathlib import Path
 
+ROOT_DIR = Path(__file__).resolve().parent
+
 def check_dependencies():
-    try:
-        import fastapi
-        import streamlit
-        import langchain
-        import openai
-        print("All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"Missing dependency: {e}")
+    # find_spec only locates the packages; the servers import them in their own processes.
+    missing = [
+        name for name in ("fastapi", "streamlit", "langchain", "langchain_google_genai")
+        if importlib.util.find_spec(name) is None
+    ]
+    if missing:
+        print(f"Missing dependencies: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    print("All dependencies are installed")
+    return True
 
 def check_configuration():
     if not Path(".env").exists():
@@ -36,33 +38,42 @@ def check_configuration():
 def start_backend():
     print("Starting FastAPI backend server...")
     try:
-        original_dir = os.getcwd()
-        
-        os.chdir("backend")
-        
         process = subprocess.Popen([
             sys.executable, "-m", "uvicorn", "main:app", 
             "--reload", "--host", "0.0.0.0", "--port", "8000"
-        ])
+        ], cwd=ROOT_DIR / "backend")
         
         print("Backend server started on http://localhost:8000")
-        return process, original_dir
+        return process
         
     except Exception as e:
         print(f"Failed to start backend: {e}")
-        return None, None
+        return None
+
+def wait_for_backend(timeout: float = 15.0) -> bool:
+    import requests
+
+    session = requests.Session()
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            try:
+                if session.get("http://localhost:8000/health", timeout=0.25).status_code == 200:
+                    return True
+            except requests.RequestException:
+                pass
+            time.sleep(0.1)
+        return False
+    finally:
+        session.close()
 
 def start_frontend():
     print("Starting Streamlit frontend...")
     try:
-
-        os.chdir("frontend")
-        
-
         process = subprocess.Popen([
             sys.executable, "-m", "streamlit", "run", "app.py",
             "--server.port", "8501"
-        ])
+        ], cwd=ROOT_DIR / "frontend")
         
         print("Frontend started on http://localhost:8501")
         return process
@@ -84,20 +95,22 @@ def main():
     
     print("\nStarting Calendar Booking Agent...")
     
-    backend_process, original_dir = start_backend()
+    backend_process = start_backend()
     if not backend_process:
         return
     
-    time.sleep(3)
-    
-    if original_dir:
-        os.chdir(original_dir)
-
+    # Start Streamlit right away so its imports overlap with the backend's startup.
     frontend_process = start_frontend()
     if not frontend_process:
         backend_process.terminate()
         return
     
+    if not wait_for_backend():
+        print("Backend did not become healthy within 15 seconds. Check the backend logs above.")
+        backend_process.terminate()
+        frontend_process.terminate()
+        return
+    
     print("\nCalendar Booking Agent is running!")
     print("Frontend: http://localhost:8501")
     print("Backend API: http://localhost:8000")